@@ -3,11 +3,16 @@ agent_loop.py — Self-correcting agentic generation loop.
 
 Flow
 
-1.  Generate an Angular component from the user's natural-language description.
+1.  Generate an Angular component from the user's natural-language description,
+    drawing INITIAL_CANDIDATES samples as parallel calls (or from one call
+    with server-side ``n`` sampling when GCA_SERVER_SIDE_N=true) and keeping
+    the first one that passes validation.
 2.  Validate the output — returns a STRUCTURED REPORT:
         { "is_valid": bool, "errors": [...], "warnings": [...] }
 3.  If validation fails, feed the original code + structured errors back to the
-    LLM and request a corrected version.
+    LLM and request a corrected version.  A stream that becomes definitely
+    invalid mid-generation is aborted early and its partial code and errors
+    are treated as a failed pass.
 4.  Repeat up to MAX_RETRIES times.
 5.  Return the final component (valid or best-effort after retries are exhausted).
 
@@ -20,37 +25,65 @@ Logging conventions
       — retry / self-correction attempt
       — hard failure (retries exhausted)
 
+The loop is implemented once, on AsyncGroq, in run_agent_loop_async, so many
+descriptions can share one event loop with overlapped network I/O (see
+``main.py --batch``); run_agent_loop is a synchronous wrapper around it.
+
 All diagnostic output goes to stderr; only the final component code goes to stdout.
 """
 
 from __future__ import annotations
 
-from typing import Dict
+import asyncio
+from typing import Callable, Dict, List, Optional, Tuple
 
-from generator import generate_component, load_design_system, regenerate_component
+from generator import (
+    GenerationAborted,
+    aclose_async_client,
+    generate_component_async,
+    generate_component_candidates_async,
+    is_demo_mode,
+    load_design_system,
+    regenerate_component_async,
+    sanitise_user_input,
+    server_side_sampling_supported,
+)
 from logger import log_error, log_info, log_lines, log_warn
-from validator import validate
+from validator import ValidationReport, validate
 
 # Maximum number of LLM self-correction attempts after the initial generation.
 MAX_RETRIES: int = 2
 
+# Number of parallel samples drawn for the initial generation.
+INITIAL_CANDIDATES: int = 3
+
+# Streamed characters between progress log lines.
+STREAM_LOG_INTERVAL: int = 1000
+
 
 def run_agent_loop(
     description: str,
     *,
     max_retries: int = MAX_RETRIES,
+    candidates: int = INITIAL_CANDIDATES,
     model: str = "llama-3.3-70b-versatile",
     verbose: bool = True,
 ) -> str:
     """
     End-to-end agentic loop: generate -> validate -> (fix -> validate)*.
 
+    Synchronous wrapper that runs run_agent_loop_async on a fresh event loop
+    and closes that loop's HTTP pool before returning, so it must not be
+    called from inside a running event loop.
+
     Parameters
     ----------
     description : str
         Natural-language description of the desired Angular component.
     max_retries : int
         Maximum number of self-correction retries allowed (default: 2).
+    candidates : int
+        Parallel samples drawn for the initial generation (default: 3).
     model : str
         Groq model identifier to use for generation.
     verbose : bool
@@ -61,28 +94,64 @@ def run_agent_loop(
     str
         Final Angular component TypeScript source code.
     """
-    tokens: Dict[str, str] = load_design_system()
 
-    log_info("Generation start: creating initial component.", verbose=verbose)
-    code: str = generate_component(description, tokens=tokens, model=model)
-    log_info("Initial generation complete.", verbose=verbose)
+    async def run() -> str:
+        try:
+            return await run_agent_loop_async(
+                description,
+                max_retries=max_retries,
+                candidates=candidates,
+                model=model,
+                verbose=verbose,
+            )
+        finally:
+            await aclose_async_client()
 
-    log_info("Running validation pass 1.", verbose=verbose)
-    report = validate(code, tokens)
+    return asyncio.run(run())
 
-    if report["is_valid"]:
-        if report["warnings"]:
-            log_lines(report["warnings"], prefix="WARN ", verbose=verbose)
-        log_info("Final success: component passed validation on first attempt.", verbose=verbose)
-        return code
 
-    log_warn(
-        f"Validation failed on first attempt with {len(report['errors'])} error(s).",
+async def run_agent_loop_async(
+    description: str,
+    *,
+    max_retries: int = MAX_RETRIES,
+    candidates: int = INITIAL_CANDIDATES,
+    model: str = "llama-3.3-70b-versatile",
+    verbose: bool = True,
+) -> str:
+    """
+    Run the agentic loop on AsyncGroq; see run_agent_loop for parameters.
+
+    Parallel candidates run as asyncio tasks on the caller's event loop, so
+    several loops can share one connection pool (see ``main.py --batch``).
+    """
+    tokens: Dict[str, str] = load_design_system()
+
+    # The demo fixture is known to pass validation (see tests/test_demo_mode.py),
+    # so demo runs skip candidates, validation and retries entirely.
+    if is_demo_mode():
+        log_info("Demo mode: returning the pre-validated fixture component.", verbose=verbose)
+        return await generate_component_async(description, tokens=tokens)
+
+    # The description is invariant across the loop, so sanitise it once.
+    user_message = sanitise_user_input(description)
+
+    log_info("Generation start: creating initial component.", verbose=verbose)
+    # Only a draft that can still be corrected may be aborted mid-stream; the
+    # last attempt always runs to completion so best-effort output is whole.
+    code, report = await _generate_initial(
+        description,
+        tokens=tokens,
+        user_message=user_message,
+        model=model,
+        candidates=candidates,
+        abort_invalid=max_retries > 0,
         verbose=verbose,
     )
-    log_lines(report["errors"], prefix="ERROR", verbose=verbose)
-    if report["warnings"]:
-        log_lines(report["warnings"], prefix="WARN ", verbose=verbose)
+
+    if report["is_valid"]:
+        _log_success("Final success: component passed validation on first attempt.", report, verbose=verbose)
+        return code
+    _log_failure("Validation failed on first attempt", report, verbose=verbose)
 
     for attempt in range(1, max_retries + 1):
         log_info(
@@ -90,35 +159,251 @@ def run_agent_loop(
             verbose=verbose,
         )
 
-        code = regenerate_component(
-            original_code=code,
-            errors=report["errors"],
-            description=description,
-            tokens=tokens,
-            model=model,
-        )
-        log_info(f"Retry {attempt} generation complete.", verbose=verbose)
-        log_info(f"Running validation pass retry-{attempt}.", verbose=verbose)
-
-        report = validate(code, tokens)
+        try:
+            code = await regenerate_component_async(
+                original_code=code,
+                errors=report["errors"],
+                description=description,
+                tokens=tokens,
+                user_message=user_message,
+                model=model,
+                on_delta=_stream_progress(f"Retry {attempt}", verbose=verbose),
+                abort_invalid=attempt < max_retries,
+            )
+        except GenerationAborted as exc:
+            log_warn(f"Retry {attempt} aborted mid-stream.", verbose=verbose)
+            code, report = _aborted_draft(exc)
+        else:
+            log_info(f"Retry {attempt} generation complete.", verbose=verbose)
+            log_info(f"Running validation pass retry-{attempt}.", verbose=verbose)
+            report = validate(code, tokens)
 
         if report["is_valid"]:
-            if report["warnings"]:
-                log_lines(report["warnings"], prefix="WARN ", verbose=verbose)
-            log_info(f"Final success: component passed after retry {attempt}.", verbose=verbose)
+            _log_success(f"Final success: component passed after retry {attempt}.", report, verbose=verbose)
             return code
+        _log_failure(f"Validation failed after retry {attempt}", report, verbose=verbose)
 
-        log_warn(
-            f"Validation failed after retry {attempt} with {len(report['errors'])} error(s).",
-            verbose=verbose,
-        )
-        log_lines(report["errors"], prefix="ERROR", verbose=verbose)
-        if report["warnings"]:
-            log_lines(report["warnings"], prefix="WARN ", verbose=verbose)
+    _log_exhausted(max_retries, report, verbose=verbose)
+    return code
+
+
+async def _generate_initial(
+    description: str,
+    *,
+    tokens: Dict[str, str],
+    user_message: str,
+    model: str,
+    candidates: int,
+    abort_invalid: bool,
+    verbose: bool,
+) -> Tuple[str, ValidationReport]:
+    """
+    Draw the initial component and its validation report.
+
+    With more than one candidate and server-side ``n`` sampling enabled, all
+    of them are first requested from a single API call.  Otherwise, or if the
+    backend returns fewer choices, the missing ones are drawn as parallel
+    tasks.  The first valid candidate wins; if none pass, the candidate with
+    the fewest errors is returned so the retry loop starts from the best draft.
+    With *abort_invalid* False no stream is cut short (see generate_component).
+    """
+    if candidates <= 1:
+        try:
+            code = await generate_component_async(
+                description,
+                tokens=tokens,
+                user_message=user_message,
+                model=model,
+                on_delta=_stream_progress("Initial generation", verbose=verbose),
+                abort_invalid=abort_invalid,
+            )
+        except GenerationAborted as exc:
+            log_warn("Initial generation aborted mid-stream.", verbose=verbose)
+            return _aborted_draft(exc)
+        log_info("Initial generation complete.", verbose=verbose)
+        log_info("Running validation pass 1.", verbose=verbose)
+        return code, validate(code, tokens)
 
+    drafts: List[str] = []
+    best: Optional[Tuple[str, ValidationReport]] = None
+    if server_side_sampling_supported():
+        log_info(f"Requesting {candidates} candidates in one call.", verbose=verbose)
+        try:
+            drafts = await generate_component_candidates_async(
+                description,
+                tokens=tokens,
+                user_message=user_message,
+                model=model,
+                n=candidates,
+                on_delta=_stream_progress("Candidates", verbose=verbose),
+                abort_invalid=abort_invalid,
+            )
+        except GenerationAborted as exc:
+            log_warn("All server-side candidates aborted mid-stream.", verbose=verbose)
+            return _aborted_draft(exc)
+
+    for index, code in enumerate(drafts):
+        report = validate(code, tokens)
+        _log_candidate(index, report, verbose=verbose)
+        if report["is_valid"]:
+            return code, report
+        best = _fewer_errors(best, (code, report))
+
+    if len(drafts) < candidates:
+        samples = range(len(drafts), candidates)
+        log_info(f"Drawing {len(samples)} candidate(s) in parallel.", verbose=verbose)
+        try:
+            drawn = await _draw_parallel(
+                description,
+                tokens=tokens,
+                user_message=user_message,
+                model=model,
+                samples=samples,
+                abort_invalid=abort_invalid,
+                verbose=verbose,
+            )
+        except Exception as exc:  # keep the server-side drafts we already have
+            if best is None:
+                raise
+            log_warn(f"Parallel candidates failed: {exc}", verbose=verbose)
+        else:
+            if drawn[1]["is_valid"]:
+                return drawn
+            best = _fewer_errors(best, drawn)
+
+    assert best is not None
+    return best
+
+
+async def _draw_parallel(
+    description: str,
+    *,
+    tokens: Dict[str, str],
+    user_message: str,
+    model: str,
+    samples: range,
+    abort_invalid: bool,
+    verbose: bool,
+) -> Tuple[str, ValidationReport]:
+    """
+    Draw one candidate per sample index as concurrent asyncio tasks.
+
+    Candidates are validated as they complete.  The first valid one wins and
+    the losing tasks are cancelled, which closes their streams; otherwise the
+    candidate with the fewest errors is returned.  Raises the first failure if
+    every draw raised.
+    """
+
+    async def draw(index: int) -> Tuple[str, ValidationReport]:
+        try:
+            code = await generate_component_async(
+                description,
+                tokens=tokens,
+                user_message=user_message,
+                model=model,
+                on_delta=_stream_progress(f"Candidate {index + 1}", verbose=verbose),
+                sample=index,
+                abort_invalid=abort_invalid,
+            )
+        except GenerationAborted as exc:
+            return _aborted_draft(exc)
+        return code, validate(code, tokens)
+
+    tasks = {asyncio.ensure_future(draw(index)): index for index in samples}
+    pending = set(tasks)
+    best: Optional[Tuple[str, ValidationReport]] = None
+    first_failure: Optional[Exception] = None
+
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in sorted(done, key=tasks.__getitem__):
+                index = tasks[task]
+                try:
+                    code, report = task.result()
+                except Exception as exc:  # one failed draw must not sink the others
+                    first_failure = first_failure or exc
+                    log_warn(f"Candidate {index + 1} failed: {exc}", verbose=verbose)
+                    continue
+
+                _log_candidate(index, report, verbose=verbose)
+                if report["is_valid"]:
+                    return code, report
+                best = _fewer_errors(best, (code, report))
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    if best is None:
+        assert first_failure is not None
+        raise first_failure
+    return best
+
+
+def _log_success(message: str, report: ValidationReport, *, verbose: bool) -> None:
+    """Log the warnings of a passing report followed by the success message."""
+    if report["warnings"]:
+        log_lines(report["warnings"], prefix="WARN ", verbose=verbose)
+    log_info(message, verbose=verbose)
+
+
+def _log_failure(prefix: str, report: ValidationReport, *, verbose: bool) -> None:
+    """Log a failed validation pass with its errors and warnings."""
+    log_warn(f"{prefix} with {len(report['errors'])} error(s).", verbose=verbose)
+    log_lines(report["errors"], prefix="ERROR", verbose=verbose)
+    if report["warnings"]:
+        log_lines(report["warnings"], prefix="WARN ", verbose=verbose)
+
+
+def _log_exhausted(max_retries: int, report: ValidationReport, *, verbose: bool) -> None:
+    """Log that the retry budget ran out, with the remaining errors."""
     log_error(
         f"Retries exhausted ({max_retries}). Returning best-effort output.",
         verbose=verbose,
     )
     log_lines(report["errors"], prefix="ERROR", verbose=verbose)
-    return code
\ No newline at end of file
+
+
+def _aborted_draft(exc: GenerationAborted) -> Tuple[str, ValidationReport]:
+    """Turn an aborted stream into a failed draft the retry loop can correct."""
+    return exc.partial_code, {"is_valid": False, "errors": exc.errors, "warnings": []}
+
+
+def _log_candidate(index: int, report: ValidationReport, *, verbose: bool) -> None:
+    """Log the validation outcome of one initial candidate."""
+    if report["is_valid"]:
+        log_info(f"Candidate {index + 1} passed validation.", verbose=verbose)
+    else:
+        log_info(
+            f"Candidate {index + 1} failed validation with {len(report['errors'])} error(s).",
+            verbose=verbose,
+        )
+
+
+def _fewer_errors(
+    best: Optional[Tuple[str, ValidationReport]],
+    candidate: Tuple[str, ValidationReport],
+) -> Tuple[str, ValidationReport]:
+    """Return whichever of *best* and *candidate* has fewer validation errors."""
+    if best is None or len(candidate[1]["errors"]) < len(best[1]["errors"]):
+        return candidate
+    return best
+
+
+def _stream_progress(label: str, *, verbose: bool) -> Optional[Callable[[str], None]]:
+    """Return an on_delta callback that logs streamed size every STREAM_LOG_INTERVAL chars."""
+    if not verbose:
+        return None
+
+    received = 0
+    next_mark = STREAM_LOG_INTERVAL
+
+    def on_delta(delta: str) -> None:
+        nonlocal received, next_mark
+        received += len(delta)
+        if received >= next_mark:
+            log_info(f"{label}: streamed {received} chars.")
+            next_mark = (received // STREAM_LOG_INTERVAL + 1) * STREAM_LOG_INTERVAL
+
+    return on_delta
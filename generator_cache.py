@@ -0,0 +1,143 @@
+"""
+generator_cache.py — On-disk response cache for Groq completions.
+
+Responsibilities
+────────────────
+• Derive a deterministic SHA-256 key from the canonicalised request
+  (model, system prompt, user message, temperature, sample index).
+• Store raw completion text under ``~/.cache/gca/`` (override with
+  GCA_CACHE_DIR) with a TTL and least-recently-used eviction.
+• Only cache near-deterministic sampling (temperature <= 0.2), so a hit is a
+  semantically safe stand-in for a fresh API round-trip.
+
+Set GCA_CACHE=off to bypass the cache entirely.  Cache I/O failures are
+never fatal: a broken cache directory simply behaves like a miss.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+# Entries older than this are treated as misses and removed.
+CACHE_TTL_SECONDS: int = 7 * 24 * 60 * 60
+
+# Maximum number of entries kept on disk; least-recently-used go first.
+CACHE_MAX_ENTRIES: int = 256
+
+# Sampling above this temperature is too random for a cached answer to stand in.
+MAX_CACHEABLE_TEMPERATURE: float = 0.2
+
+_DEFAULT_CACHE_DIR = Path.home() / ".cache" / "gca"
+
+
+def cache_enabled() -> bool:
+    """Return False when the cache is disabled via GCA_CACHE=off."""
+    return os.getenv("GCA_CACHE", "").lower() != "off"
+
+
+def cache_dir() -> Path:
+    """Return the directory holding cache entries."""
+    return Path(os.getenv("GCA_CACHE_DIR") or _DEFAULT_CACHE_DIR)
+
+
+def is_cacheable(temperature: float) -> bool:
+    """Return True when a response sampled at *temperature* may be cached."""
+    return temperature <= MAX_CACHEABLE_TEMPERATURE
+
+
+def cache_key(
+    model: str,
+    system_prompt: str,
+    user_message: str,
+    temperature: float,
+    sample: int = 0,
+) -> str:
+    """
+    Return the SHA-256 hex digest of the canonicalised request.
+
+    *sample* distinguishes parallel draws of the same request so each
+    candidate is cached on its own instead of collapsing onto one entry.
+    """
+    payload = json.dumps(
+        {
+            "model": model,
+            "system_prompt": system_prompt,
+            "user_message": user_message,
+            "temperature": temperature,
+            "sample": sample,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_cached_response(key: str) -> Optional[str]:
+    """Return the cached completion for *key*, or None on a miss, expiry or corrupt entry."""
+    path = cache_dir() / f"{key}.json"
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            entry = json.load(fh)
+    except OSError:
+        return None
+    except ValueError:
+        # Writes are atomic (see store_response), so unparsable JSON is corruption.
+        _remove(path)
+        return None
+
+    # Anything but {"created": <number>, "value": <str>} is corrupt: drop it.
+    created = entry.get("created") if isinstance(entry, dict) else None
+    if (
+        not isinstance(created, (int, float))
+        or isinstance(created, bool)
+        or not isinstance(entry.get("value"), str)
+        or time.time() - created > CACHE_TTL_SECONDS
+    ):
+        _remove(path)
+        return None
+
+    # Bump mtime so eviction treats this entry as recently used.
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return entry["value"]
+
+
+def store_response(key: str, value: str) -> None:
+    """Persist *value* under *key* and evict entries beyond CACHE_MAX_ENTRIES."""
+    directory = cache_dir()
+    path = directory / f"{key}.json"
+    tmp_path = directory / f"{key}.{os.getpid()}.tmp"
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump({"created": time.time(), "value": value}, fh)
+        os.replace(tmp_path, path)
+    except OSError:
+        _remove(tmp_path)
+        return
+    _evict(directory)
+
+
+def _evict(directory: Path) -> None:
+    """Delete least-recently-used entries until the cache fits its budget."""
+    try:
+        entries = sorted(directory.glob("*.json"), key=lambda p: p.stat().st_mtime)
+    except OSError:
+        return
+    for path in entries[: max(0, len(entries) - CACHE_MAX_ENTRIES)]:
+        _remove(path)
+
+
+def _remove(path: Path) -> None:
+    """Delete *path*, ignoring errors."""
+    try:
+        path.unlink()
+    except OSError:
+        pass
@@ -0,0 +1,69 @@
+"""
+hyperscan_support.py — Optional Hyperscan acceleration for fixed regex sets.
+
+Hyperscan compiles a whole set of patterns into one automaton and scans the
+input in a single pass, reporting ``(pattern_id, start, end)`` for each match.
+It is an optional dependency: when the ``hyperscan`` package is missing, or a
+pattern uses syntax it cannot compile, compile_database() returns None and
+callers keep using their ``re``-based path.
+
+Offsets are byte offsets into the UTF-8 encoded input.
+"""
+
+from __future__ import annotations
+
+from typing import Any, List, Optional, Sequence, Tuple
+
+try:
+    import hyperscan
+except ImportError:  # optional dependency
+    hyperscan = None
+
+
+def compile_database(expressions: Sequence[str], *, caseless: Sequence[bool]) -> Optional[Any]:
+    """
+    Compile *expressions* into a block-mode database reporting match starts.
+
+    Pattern ids are the indices into *expressions*.  Returns None when
+    Hyperscan is unavailable or rejects a pattern.
+    """
+    if hyperscan is None:
+        return None
+
+    flags = [
+        hyperscan.HS_FLAG_SOM_LEFTMOST | (hyperscan.HS_FLAG_CASELESS if fold else 0)
+        for fold in caseless
+    ]
+    database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+    try:
+        database.compile(
+            expressions=[expression.encode("utf-8") for expression in expressions],
+            ids=list(range(len(expressions))),
+            elements=len(expressions),
+            flags=flags,
+        )
+    except hyperscan.HyperscanError:
+        return None
+    return database
+
+
+def scan(database: Any, data: bytes) -> List[Tuple[int, int, int]]:
+    """Return every ``(pattern_id, start, end)`` match reported for *data*."""
+    matches: List[Tuple[int, int, int]] = []
+
+    def on_match(pattern_id: int, start: int, end: int, flags: int, context: Any) -> None:
+        matches.append((pattern_id, start, end))
+
+    database.scan(data, match_event_handler=on_match)
+    return matches
+
+
+def merge_spans(matches: Sequence[Tuple[int, int, int]]) -> List[Tuple[int, int]]:
+    """Collapse overlapping match spans into sorted, disjoint ``(start, end)`` pairs."""
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted((start, end) for _, start, end in matches):
+        if merged and start < merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
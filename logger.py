@@ -1,38 +1,78 @@
-"""Lightweight timestamped logger for CLI diagnostics."""
+"""
+Lightweight timestamped logger for CLI diagnostics.
+
+Messages go through the standard ``logging`` module on the "gca" logger, so
+output can be filtered (configure_logging(quiet=True) keeps warnings and
+errors only) or redirected with extra handlers.  The default handler writes
+``[HH:MM:SS] LEVEL message`` lines to whatever ``sys.stderr`` is at emit time.
+"""
 
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Iterable
+import logging
 import sys
+from typing import Iterable
+
+logger = logging.getLogger("gca")
+
+# Fixed-width level tags kept from the original print-based output.
+_TAGS = {logging.INFO: "INFO ", logging.WARNING: "WARN ", logging.ERROR: "ERROR"}
+
+
+class _StderrHandler(logging.StreamHandler):
+    """StreamHandler that resolves sys.stderr lazily, so redirection is honoured."""
+
+    @property
+    def stream(self):  # type: ignore[override]
+        return sys.stderr
+
+    @stream.setter
+    def stream(self, value) -> None:
+        pass
+
+
+class _TagFormatter(logging.Formatter):
+    """Format records as ``[HH:MM:SS] TAG message``."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        tag = getattr(record, "tag", None) or _TAGS.get(record.levelno, record.levelname)
+        return f"[{self.formatTime(record, '%H:%M:%S')}] {tag} {record.getMessage()}"
+
+
+_handler = _StderrHandler()
+_handler.setFormatter(_TagFormatter())
+logger.addHandler(_handler)
+logger.setLevel(logging.INFO)
+logger.propagate = False
+
+
+def configure_logging(*, quiet: bool = False) -> None:
+    """Show informational messages, or only warnings and errors when *quiet*."""
+    logger.setLevel(logging.WARNING if quiet else logging.INFO)
 
 
 def log_info(message: str, *, verbose: bool = True) -> None:
     """Log informational message to stderr with timestamp."""
     if verbose:
-        print(f"[{_ts()}] INFO  {message}", file=sys.stderr)
+        logger.info(message)
 
 
 def log_warn(message: str, *, verbose: bool = True) -> None:
     """Log warning message to stderr with timestamp."""
     if verbose:
-        print(f"[{_ts()}] WARN  {message}", file=sys.stderr)
+        logger.warning(message)
 
 
 def log_error(message: str, *, verbose: bool = True) -> None:
     """Log error message to stderr with timestamp."""
     if verbose:
-        print(f"[{_ts()}] ERROR {message}", file=sys.stderr)
+        logger.error(message)
 
 
 def log_lines(lines: Iterable[str], *, prefix: str, verbose: bool = True) -> None:
     """Log multiple lines with timestamp and custom prefix."""
     if not verbose:
         return
+    level = logging.ERROR if prefix.strip() == "ERROR" else logging.WARNING
     for line in lines:
-        print(f"[{_ts()}] {prefix} {line}", file=sys.stderr)
-
-
-def _ts() -> str:
-    """Current local timestamp in HH:MM:SS format."""
-    return datetime.now().strftime("%H:%M:%S")
+        logger.log(level, line, extra={"tag": prefix})
@@ -5,23 +5,42 @@ Usage
 ─────
     python main.py
     python main.py "A login card with glassmorphism effect"
+    python main.py --batch --concurrency 8 < jobs.ndjson > results.ndjson
 
-If no argument is provided the program prompts interactively.
+If no description is provided the program prompts interactively.
+
+Batch mode reads one job per stdin line — ``{"id": ..., "description": ...}``
+(a plain-text line is taken as the description, with its line number as id) —
+and writes ``{"id": ..., "code": ...}`` or ``{"id": ..., "error": ...}`` lines
+as jobs complete, so output order can differ from input order.  All jobs share
+one process, event loop and HTTP connection pool.
 """
 
 from __future__ import annotations
 
+import argparse
+import json
 import os
 import sys
+from typing import Any, Dict, List, Optional
 
-from dotenv import load_dotenv
-
-# Load .env file if present (for OPENAI_API_KEY and other config).
-load_dotenv()
+DEFAULT_MODEL: str = "llama-3.3-70b-versatile"
+DEFAULT_CONCURRENCY: int = 4
 
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
     """Run the Guided Component Architect CLI."""
+    args = _parse_args(argv)
+
+    from logger import configure_logging
+
+    configure_logging(quiet=args.quiet)
+
+    # Imported after argument parsing so --help stays instant.
+    from dotenv import load_dotenv
+
+    # Load .env file if present (for GROQ_API_KEY and other config).
+    load_dotenv()
 
     # ── Validate environment ──────────────────────────────────────────
     if not os.getenv("GROQ_API_KEY"):
@@ -32,9 +51,15 @@ def main() -> None:
         )
         sys.exit(1)
 
+    if args.batch:
+        import asyncio
+
+        asyncio.run(_run_batch(args))
+        return
+
     # ── Obtain user description ───────────────────────────────────────
-    if len(sys.argv) > 1:
-        description = " ".join(sys.argv[1:])
+    if args.description:
+        description = " ".join(args.description)
     else:
         print("╔══════════════════════════════════════════════╗")
         print("║   Guided Component Architect                ║")
@@ -53,7 +78,7 @@ def main() -> None:
     print("  Guided Component Architect — Generation Pipeline", file=sys.stderr)
     print("═" * 60 + "\n", file=sys.stderr)
 
-    component_code: str = run_agent_loop(description, verbose=True)
+    component_code: str = run_agent_loop(description, verbose=True, **_loop_options(args))
 
     # ── Output ────────────────────────────────────────────────────────
     print("\n" + "═" * 60, file=sys.stderr)
@@ -64,5 +89,84 @@ def main() -> None:
     print(component_code)
 
 
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Generate a design-system-compliant Angular component.",
+    )
+    parser.add_argument("description", nargs="*", help="component description (prompted for if omitted)")
+    parser.add_argument("--batch", action="store_true", help="read NDJSON jobs from stdin, write NDJSON results")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="batch jobs run at once")
+    parser.add_argument("--max-retries", type=int, default=None, help="self-correction attempts per job (default: 2)")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="Groq model name")
+    parser.add_argument("--quiet", action="store_true", help="log only warnings and errors to stderr")
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    return args
+
+
+def _loop_options(args: argparse.Namespace) -> Dict[str, Any]:
+    """Return the agent-loop keyword arguments selected on the command line."""
+    options: Dict[str, Any] = {"model": args.model}
+    if args.max_retries is not None:
+        options["max_retries"] = args.max_retries
+    return options
+
+
+def _parse_job(line: str, line_number: int) -> Dict[str, Any]:
+    """Parse one batch line into a job with ``id`` and ``description``."""
+    try:
+        job = json.loads(line)
+    except ValueError:
+        return {"id": line_number, "description": line}
+    if not isinstance(job, dict):
+        return {"id": line_number, "description": line}
+    job.setdefault("id", line_number)
+    return job
+
+
+async def _run_batch(args: argparse.Namespace) -> None:
+    """Drain stdin jobs through ``--concurrency`` workers, printing results as they finish."""
+    import asyncio
+
+    from agent_loop import run_agent_loop_async
+    from generator import aclose_async_client
+
+    options = _loop_options(args)
+    # Bounded so a large input applies back-pressure instead of buffering it all.
+    queue: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue(maxsize=2 * args.concurrency)
+
+    async def worker() -> None:
+        while True:
+            job = await queue.get()
+            if job is None:
+                return
+            record: Dict[str, Any] = {"id": job["id"]}
+            description = str(job.get("description") or "").strip()
+            try:
+                if not description:
+                    raise ValueError("empty description")
+                record["code"] = await run_agent_loop_async(description, verbose=False, **options)
+            except Exception as exc:  # report per job; keep draining the queue
+                record["error"] = f"{type(exc).__name__}: {exc}"
+            print(json.dumps(record, ensure_ascii=False), flush=True)
+
+    workers = [asyncio.create_task(worker()) for _ in range(args.concurrency)]
+    loop = asyncio.get_running_loop()
+    line_number = 0
+    # Read stdin off the loop so jobs start while later lines are still arriving.
+    while line := await loop.run_in_executor(None, sys.stdin.readline):
+        line_number += 1
+        if line.strip():
+            await queue.put(_parse_job(line.strip(), line_number))
+    for _ in workers:
+        await queue.put(None)
+    try:
+        await asyncio.gather(*workers)
+    finally:
+        await aclose_async_client()
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,144 @@
+"""Unit tests for the agent loop with generation stubbed out."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+import agent_loop
+from generator import _DEMO_COMPONENT, GenerationAborted
+
+VALID_CODE = _DEMO_COMPONENT.strip()
+BROKEN_CODE = "export class Broken {"
+
+
+@pytest.fixture(autouse=True)
+def _live_mode(monkeypatch) -> None:
+    # DEMO_MODE short-circuits the loop before any stubbed generator runs.
+    monkeypatch.delenv("DEMO_MODE", raising=False)
+
+
+async def _fail(*args, **kwargs):
+    raise AssertionError("unexpected call")
+
+
+def test_server_side_candidates_return_first_valid_draw(monkeypatch) -> None:
+    async def fake_candidates(description, **kwargs):
+        return [BROKEN_CODE, VALID_CODE, BROKEN_CODE]
+
+    monkeypatch.setattr(agent_loop, "server_side_sampling_supported", lambda: True)
+    monkeypatch.setattr(agent_loop, "generate_component_candidates_async", fake_candidates)
+    monkeypatch.setattr(agent_loop, "generate_component_async", _fail)
+    monkeypatch.setattr(agent_loop, "regenerate_component_async", _fail)
+
+    code = agent_loop.run_agent_loop("A card", candidates=3, verbose=False)
+
+    assert code == VALID_CODE
+
+
+def test_missing_candidates_are_drawn_in_parallel(monkeypatch) -> None:
+    samples = []
+
+    async def fake_candidates(description, **kwargs):
+        return [BROKEN_CODE]
+
+    async def fake_generate(description, **kwargs):
+        samples.append(kwargs["sample"])
+        return VALID_CODE if kwargs["sample"] == 2 else BROKEN_CODE
+
+    monkeypatch.setattr(agent_loop, "server_side_sampling_supported", lambda: True)
+    monkeypatch.setattr(agent_loop, "generate_component_candidates_async", fake_candidates)
+    monkeypatch.setattr(agent_loop, "generate_component_async", fake_generate)
+    monkeypatch.setattr(agent_loop, "regenerate_component_async", _fail)
+
+    code = agent_loop.run_agent_loop("A card", candidates=3, verbose=False)
+
+    assert code == VALID_CODE
+    assert sorted(samples) == [1, 2]
+
+
+def test_default_run_draws_candidates_in_parallel_without_n(monkeypatch) -> None:
+    samples = []
+
+    async def fake_generate(description, **kwargs):
+        samples.append(kwargs["sample"])
+        await asyncio.sleep(0)
+        return VALID_CODE
+
+    monkeypatch.delenv("GCA_SERVER_SIDE_N", raising=False)
+    monkeypatch.setattr(agent_loop, "generate_component_candidates_async", _fail)
+    monkeypatch.setattr(agent_loop, "generate_component_async", fake_generate)
+
+    assert agent_loop.run_agent_loop("A card", candidates=3, verbose=False) == VALID_CODE
+    assert sorted(samples) == [0, 1, 2]
+
+
+def test_retry_starts_from_candidate_with_fewest_errors(monkeypatch) -> None:
+    drafts = {0: BROKEN_CODE, 1: VALID_CODE.replace("#6366f1", "#ff0000", 1)}
+    seen_originals = []
+
+    async def fake_generate(description, **kwargs):
+        return drafts[kwargs["sample"]]
+
+    async def fake_regenerate(**kwargs):
+        seen_originals.append(kwargs["original_code"])
+        return VALID_CODE
+
+    monkeypatch.setattr(agent_loop, "server_side_sampling_supported", lambda: False)
+    monkeypatch.setattr(agent_loop, "generate_component_async", fake_generate)
+    monkeypatch.setattr(agent_loop, "regenerate_component_async", fake_regenerate)
+
+    code = agent_loop.run_agent_loop("A card", candidates=2, verbose=False)
+
+    assert code == VALID_CODE
+    assert seen_originals == [drafts[1]]
+
+
+def test_description_is_sanitised_once_per_loop(monkeypatch) -> None:
+    sanitised = []
+    seen_messages = []
+
+    def fake_sanitise(description):
+        sanitised.append(description)
+        return f"clean {description}"
+
+    async def fake_generate(description, **kwargs):
+        seen_messages.append(kwargs["user_message"])
+        return BROKEN_CODE
+
+    async def fake_regenerate(**kwargs):
+        seen_messages.append(kwargs["user_message"])
+        return BROKEN_CODE
+
+    monkeypatch.setattr(agent_loop, "sanitise_user_input", fake_sanitise)
+    monkeypatch.setattr(agent_loop, "generate_component_async", fake_generate)
+    monkeypatch.setattr(agent_loop, "regenerate_component_async", fake_regenerate)
+
+    agent_loop.run_agent_loop("A card", candidates=1, max_retries=2, verbose=False)
+
+    assert sanitised == ["A card"]
+    assert seen_messages == ["clean A card"] * 3
+
+
+
+def test_final_attempt_is_never_aborted_mid_stream(monkeypatch) -> None:
+    full_broken = VALID_CODE.replace("#6366f1", "#ff0000", 1)
+    abort_flags = []
+
+    async def fake_generate(description, **kwargs):
+        return BROKEN_CODE
+
+    async def fake_regenerate(**kwargs):
+        abort_flags.append(kwargs["abort_invalid"])
+        if kwargs["abort_invalid"]:
+            raise GenerationAborted("@Component({", ["UNAUTHORIZED_COLOR: #ff0000"])
+        return full_broken
+
+    monkeypatch.setattr(agent_loop, "generate_component_async", fake_generate)
+    monkeypatch.setattr(agent_loop, "regenerate_component_async", fake_regenerate)
+
+    code = agent_loop.run_agent_loop("A card", candidates=1, max_retries=2, verbose=False)
+
+    assert abort_flags == [True, False]
+    assert code == full_broken
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
-from generator import generate_component, load_design_system, regenerate_component
+import agent_loop
+from generator import _DEMO_COMPONENT, generate_component, load_design_system, regenerate_component
+from validator import validate
 
 
 def test_generate_component_in_demo_mode(monkeypatch) -> None:
@@ -30,3 +32,18 @@ def test_regenerate_component_in_demo_mode(monkeypatch) -> None:
 
     assert "@Component" in code
     assert "LoginCardComponent" in code
+
+
+def test_demo_fixture_passes_validation() -> None:
+    assert validate(_DEMO_COMPONENT.strip(), load_design_system())["is_valid"]
+
+
+def test_agent_loop_returns_fixture_without_validating_in_demo_mode(monkeypatch) -> None:
+    monkeypatch.setenv("DEMO_MODE", "true")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("validator should not run in demo mode")
+
+    monkeypatch.setattr(agent_loop, "validate", fail)
+
+    assert agent_loop.run_agent_loop("A card", verbose=False) == _DEMO_COMPONENT.strip()
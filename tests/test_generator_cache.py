@@ -0,0 +1,76 @@
+"""Unit tests for the on-disk Groq response cache."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+import generator_cache
+from generator_cache import cache_enabled, cache_key, get_cached_response, store_response
+
+
+def test_cache_key_is_deterministic_and_request_sensitive() -> None:
+    key = cache_key("model-a", "system", "user", 0.2)
+
+    assert key == cache_key("model-a", "system", "user", 0.2)
+    assert len(key) == 64
+    assert key != cache_key("model-b", "system", "user", 0.2)
+    assert key != cache_key("model-a", "system", "other user", 0.2)
+    assert key != cache_key("model-a", "system", "user", 0.15)
+
+
+def test_store_and_get_round_trip(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("GCA_CACHE_DIR", str(tmp_path))
+    key = cache_key("model", "system", "user", 0.2)
+
+    assert get_cached_response(key) is None
+    store_response(key, "export class CachedComponent {}")
+    assert get_cached_response(key) == "export class CachedComponent {}"
+
+
+def test_expired_entries_are_misses(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("GCA_CACHE_DIR", str(tmp_path))
+    key = cache_key("model", "system", "user", 0.2)
+    store_response(key, "stale")
+
+    monkeypatch.setattr(generator_cache, "CACHE_TTL_SECONDS", -1)
+    assert get_cached_response(key) is None
+    assert not (tmp_path / f"{key}.json").exists()
+
+
+def test_least_recently_used_entries_are_evicted(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("GCA_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(generator_cache, "CACHE_MAX_ENTRIES", 2)
+
+    keys = [cache_key("model", "system", f"user {i}", 0.2) for i in range(3)]
+    for age, key in enumerate(keys):
+        store_response(key, key)
+        stamp = 1_000_000 + age
+        os.utime(tmp_path / f"{key}.json", (stamp, stamp))
+
+    assert get_cached_response(keys[0]) is None
+    assert get_cached_response(keys[1]) == keys[1]
+    assert get_cached_response(keys[2]) == keys[2]
+
+
+def test_cache_can_be_disabled(monkeypatch) -> None:
+    monkeypatch.setenv("GCA_CACHE", "off")
+    assert cache_enabled() is False
+
+    monkeypatch.setenv("GCA_CACHE", "on")
+    assert cache_enabled() is True
+
+
+@pytest.mark.parametrize(
+    "content",
+    ["[]", '"text"', '{"created": "yesterday", "value": "x"}', '{"created": 1e18}', "{"],
+)
+def test_malformed_entries_are_misses(monkeypatch, tmp_path, content) -> None:
+    monkeypatch.setenv("GCA_CACHE_DIR", str(tmp_path))
+    key = cache_key("model", "system", "user", 0.2)
+    path = tmp_path / f"{key}.json"
+    path.write_text(content, encoding="utf-8")
+
+    assert get_cached_response(key) is None
+    assert not path.exists()
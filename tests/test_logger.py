@@ -0,0 +1,31 @@
+"""Unit tests for the logging-backed CLI logger."""
+
+from __future__ import annotations
+
+import re
+
+from logger import configure_logging, log_error, log_info, log_lines, log_warn
+
+
+def test_log_lines_use_timestamped_tags(capsys) -> None:
+    log_info("started")
+    log_lines(["bad colour"], prefix="ERROR")
+    log_warn("retrying", verbose=False)
+
+    lines = capsys.readouterr().err.splitlines()
+    assert len(lines) == 2
+    assert re.fullmatch(r"\[\d\d:\d\d:\d\d\] INFO  started", lines[0])
+    assert lines[1].endswith("] ERROR bad colour")
+
+
+def test_quiet_keeps_only_warnings_and_errors(capsys) -> None:
+    configure_logging(quiet=True)
+    try:
+        log_info("hidden")
+        log_error("shown")
+    finally:
+        configure_logging()
+
+    err = capsys.readouterr().err
+    assert "hidden" not in err
+    assert err.splitlines()[-1].endswith("] ERROR shown")
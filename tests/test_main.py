@@ -0,0 +1,34 @@
+"""Unit tests for the CLI batch runner with the agent loop stubbed out."""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+
+import agent_loop
+import main
+
+
+def test_batch_streams_one_result_per_job(monkeypatch, capsys) -> None:
+    async def fake_loop(description, **kwargs):
+        await asyncio.sleep(0.01 if description == "slow" else 0)
+        if description == "boom":
+            raise RuntimeError("network down")
+        return f"code for {description}"
+
+    monkeypatch.setattr(agent_loop, "run_agent_loop_async", fake_loop)
+    monkeypatch.setattr(
+        "sys.stdin",
+        io.StringIO('{"id": "a", "description": "slow"}\nboom\n\n{"description": ""}\nfast\n'),
+    )
+
+    asyncio.run(main._run_batch(main._parse_args(["--batch", "--concurrency", "2"])))
+
+    records = {record["id"]: record for record in map(json.loads, capsys.readouterr().out.splitlines())}
+    assert records == {
+        "a": {"id": "a", "code": "code for slow"},
+        2: {"id": 2, "error": "RuntimeError: network down"},
+        4: {"id": 4, "error": "ValueError: empty description"},
+        5: {"id": 5, "code": "code for fast"},
+    }
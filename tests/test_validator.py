@@ -2,7 +2,18 @@
 
 from __future__ import annotations
 
-from validator import validate_colors, validate_structure, validate_syntax
+import pytest
+
+import validator
+from validator import (
+    validate,
+    validate_batch,
+    validate_colors,
+    validate_design_tokens,
+    validate_partial,
+    validate_structure,
+    validate_syntax,
+)
 
 
 TOKENS = {
@@ -14,6 +25,20 @@ TOKENS = {
 }
 
 
+@pytest.mark.parametrize("use_automaton", [True, False])
+def test_validate_design_tokens_reports_only_missing_tokens(monkeypatch, use_automaton) -> None:
+    if not use_automaton:
+        monkeypatch.setattr(validator, "ahocorasick", None)
+    elif validator.ahocorasick is None:
+        pytest.skip("pyahocorasick not installed")
+
+    code = "color: #6366F1; border-radius: 8px;"
+
+    assert validate_design_tokens(code, TOKENS) == [
+        "MISSING_FONT_FAMILY: Font family token not found."
+    ]
+
+
 def test_validate_colors_allows_only_design_hex_tokens() -> None:
     code = """
     .card {
@@ -26,6 +51,16 @@ def test_validate_colors_allows_only_design_hex_tokens() -> None:
     assert errors == []
 
 
+def test_validate_colors_compares_hex_by_rgb_value() -> None:
+    tokens = {**TOKENS, "secondary_color": "#ffffff"}
+    code = "a { color: #6366F1; background: #FFF; border: #fffffff0; outline: #ffff; }"
+
+    assert validate_colors(code, tokens) == [
+        "UNAUTHORIZED_COLOR: #fffffff0 is not part of the design system.",
+        "UNAUTHORIZED_COLOR: #ffff is not part of the design system.",
+    ]
+
+
 def test_validate_colors_rejects_rgba_rgb_hsl_named_and_unknown_hex() -> None:
     code = """
     .card {
@@ -45,6 +80,49 @@ def test_validate_colors_rejects_rgba_rgb_hsl_named_and_unknown_hex() -> None:
     assert any("UNAUTHORIZED_COLOR: black" in item for item in errors)
 
 
+def test_validate_colors_matches_whole_identifiers_only() -> None:
+    code = """
+    .card { color: White; }
+    <div [class.active]="isActive" class="gold-accent"></div>
+    animation: navy-pulse 1s;
+    """
+    errors = validate_colors(code, TOKENS)
+
+    assert errors == ["UNAUTHORIZED_COLOR: White is not part of the design system."]
+
+
+def test_hyperscan_colour_scan_matches_re(monkeypatch) -> None:
+    if validator._COLOR_HS is None:
+        pytest.skip("hyperscan not installed")
+
+    code = "a { color: RGB (1, 2, 3); b: rgba(rgb(1)); c: #6366f1 #abc #abcdefab1 #fff; }"
+    accelerated = validator._color_literals(code)
+    monkeypatch.setattr(validator, "_COLOR_HS", None)
+
+    assert accelerated == validator._color_literals(code)
+    assert accelerated == (["RGB (1, 2, 3)", "rgba(rgb(1)"], ["#6366f1", "#abc", "#fff"])
+
+
+def test_re2_scan_patterns_match_re(monkeypatch) -> None:
+    if validator.re2 is None:
+        pytest.skip("google-re2 not installed")
+
+    re2_scans = tuple(validator.re2.compile(validator._re2_source(p)) for p in validator._RE_SCANS)
+    code = (
+        "@Component({})\nexport\x0bclass Card {\n  total:\x1cnumber = 1;\n"
+        "  go(): void { x = RGB (1, 2); }\n}"
+    )
+    for pattern, accelerated in zip(validator._RE_SCANS, re2_scans):
+        assert [m.span() for m in accelerated.finditer(code)] == [
+            m.span() for m in pattern.finditer(code)
+        ]
+
+    monkeypatch.setattr(validator, "_RE2_SCANS", re2_scans)
+    assert validate_structure(code) == []
+    # RE2's \w is ASCII-only, so non-ASCII sources stay on re.
+    assert validate_structure("@Component({})\nexport class Café { x: number = 1; go(): void {} }") == []
+
+
 def test_validate_syntax_detects_early_closing_and_unclosed_template_string() -> None:
     code = """
     @Component({
@@ -64,6 +142,36 @@ def test_validate_syntax_detects_early_closing_and_unclosed_template_string() ->
     assert len(errors) >= 1
 
 
+def test_validate_syntax_reports_line_numbers_across_comments_and_strings() -> None:
+    code = "/* one\n two */\nconst a = 'x\\\ny';\n/* three\n*/ ]\n(\n"
+    errors = validate_syntax(code)
+
+    assert errors == [
+        "SYNTAX_ERROR: Early closing ']' found on line 6.",
+        "SYNTAX_ERROR: Missing closing ')' for '(' opened on line 7.",
+    ]
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "<div>{{ a / b }}</div>\n]\n(",
+        "const a = '(' / 2;\n<p></p> ]",
+        "// (\n/* [ */ x = 1 / 2; }\n{",
+        "const a = \"//\";\n`${ b }` ) [",
+    ],
+)
+def test_specialised_syntax_scanners_match_full_scan(monkeypatch, code) -> None:
+    specialised = validate_syntax(code)
+    full = validator._SYNTAX_SPECIAL_RES[True, True]
+    monkeypatch.setattr(
+        validator, "_SYNTAX_SPECIAL_RES", dict.fromkeys(validator._SYNTAX_SPECIAL_RES, full)
+    )
+
+    assert specialised == validate_syntax(code)
+    assert specialised
+
+
 def test_validate_structure_requires_typed_property_and_method() -> None:
     invalid_code = """
     @Component({selector: 'x', template: '', styles: []})
@@ -87,3 +195,45 @@ def test_validate_structure_requires_typed_property_and_method() -> None:
         "INCOMPLETE_STRUCTURE: Angular component structure invalid."
     ]
     assert validate_structure(valid_code) == []
+
+
+def test_validate_partial_flags_only_errors_later_output_cannot_fix() -> None:
+    doomed = ".card { color: #ffffff; }\n.btn { color: #6366f"
+    pending = "@Component({\n  template: `\n    <div>\n.btn { color: #ff"
+    misnested = "export class A {\n  items = [1, 2);\n"
+
+    assert validate_partial(doomed, TOKENS) == (
+        True,
+        ["UNAUTHORIZED_COLOR: #ffffff is not part of the design system."],
+    )
+    assert validate_partial(pending, TOKENS) == (False, [])
+    invalid, errors = validate_partial(misnested, TOKENS)
+    assert invalid
+    assert errors[0].startswith("SYNTAX_ERROR: Improper nesting on line 2")
+
+
+def test_validators_append_into_a_shared_error_list() -> None:
+    errors = ["EARLIER: kept"]
+
+    result = validate_colors("a { color: red; b: red; }", TOKENS, errors=errors)
+    validate_structure("export class A {}", errors=errors)
+
+    assert result is errors
+    assert errors == [
+        "EARLIER: kept",
+        "UNAUTHORIZED_COLOR: red is not part of the design system.",
+        "INCOMPLETE_STRUCTURE: Angular component structure invalid.",
+    ]
+
+
+def test_validate_batch_matches_serial_validation_in_order() -> None:
+    codes = [
+        "export class A { x: number = 1; go(): void {} }",
+        "a { color: red; }",
+        "export class B {",
+    ]
+
+    expected = [validate(code, TOKENS) for code in codes]
+
+    assert validate_batch(codes, TOKENS, max_workers=2, chunksize=1) == expected
+    assert validate_batch(codes, TOKENS, max_workers=1) == expected
@@ -7,8 +7,141 @@ validation report suitable for agentic retry loops.
 
 from __future__ import annotations
 
+import functools
+import os
 import re
-from typing import Dict, List, TypedDict
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple, TypedDict
+
+from hyperscan_support import compile_database, scan
+
+try:
+    import ahocorasick
+except ImportError:  # optional dependency
+    ahocorasick = None
+
+try:
+    import re2
+except ImportError:  # optional dependency
+    re2 = None
+
+
+# ──────────────────────────────────────────────
+# Precompiled patterns
+# ──────────────────────────────────────────────
+# Compiled once at import so validation calls skip the re module's cache lookup.
+
+_TOKEN_HEX_RE = re.compile(r"#[0-9a-fA-F]{6}")
+# Group-free, so findall returns whole literals without building Match objects.
+_FUNCTIONAL_COLOR_RE = re.compile(r"\b(?:rgba?|hsla?|hwb)\s*\([^)]*\)", re.IGNORECASE)
+_HEX_COLOR_RE = re.compile(r"#[0-9a-fA-F]{3,8}\b")
+# Every "colon value identifier" is matched once and looked up in _NAMED_COLORS,
+# so adding a colour is a set insert rather than a longer regex.  Whole
+# identifiers are captured, so hyphenated names like ``gold-accent`` are not
+# misread as the colour ``gold``.
+_NAMED_VALUE_RE = re.compile(r":\s*([A-Za-z][A-Za-z0-9-]*)\b")
+
+# With Hyperscan installed, rules 1 and 2 of validate_colors share one pass
+# over ASCII sources.  Hyperscan's \b and \s are ASCII-only (and \b is not
+# available in its Unicode mode), so non-ASCII input stays on the re path and
+# \s is spelled out as the ASCII characters Python's \s matches.
+_COLOR_HS = compile_database(
+    [
+        r"\b(?:rgba?|hsla?|hwb)[\t\n\x0b\x0c\r\x1c-\x1f ]*\([^)]*\)",
+        _HEX_COLOR_RE.pattern,
+    ],
+    caseless=[True, False],
+)
+
+_NAMED_COLORS = frozenset(
+    {
+        "black",
+        "white",
+        "red",
+        "blue",
+        "green",
+        "yellow",
+        "orange",
+        "purple",
+        "pink",
+        "brown",
+        "gray",
+        "grey",
+        "teal",
+        "navy",
+        "maroon",
+        "cyan",
+        "magenta",
+        "gold",
+        "silver",
+        "lime",
+        "olive",
+        "coral",
+        "tomato",
+        "violet",
+        "indigo",
+    }
+)
+
+_EXPORT_CLASS_RE = re.compile(r"\bexport\s+class\s+\w+\s*\{")
+
+# Typed property, e.g. foo: string = 'bar';  or  total: number;
+_TYPED_PROPERTY_RE = re.compile(
+    r"\b(?:public|private|protected)?\s*\w+\s*:\s*"
+    r"[A-Za-z_][A-Za-z0-9_<>,\[\]\s|]*\s*(=|;)"
+)
+
+# Method signature, e.g. submit(): void { ... }
+_METHOD_RE = re.compile(
+    r"\b\w+\s*\([^)]*\)\s*(?::\s*[A-Za-z_][A-Za-z0-9_<>,\[\]\s|]*)?\s*\{"
+)
+
+# Whole-source scans that start at a \b and so cannot use re's literal-prefix
+# search.  With GCA_RE2=true and google-re2 installed they run on RE2's DFA
+# instead (measured 3-10x faster, and immune to backtracking blow-ups).  The
+# dense literal-prefix patterns above stay on re, whose per-match overhead is
+# far lower than the re2 binding's.  RE2's \b and \w are ASCII-only, so it is
+# used only for ASCII sources, where \s is spelled as the set re matches.
+_RE_SCANS = (_FUNCTIONAL_COLOR_RE, _EXPORT_CLASS_RE, _TYPED_PROPERTY_RE, _METHOD_RE)
+
+
+def _re2_source(pattern: "re.Pattern[str]") -> str:
+    """Translate *pattern* to RE2 syntax with re's ASCII whitespace and flags."""
+    source = pattern.pattern
+    parts = ["(?i)" if pattern.flags & re.IGNORECASE else ""]
+    in_class = False
+    i = 0
+    while i < len(source):
+        char = source[i]
+        if char == "\\":
+            escape = source[i : i + 2]
+            if escape == r"\s":
+                escape = r"\s\x0b\x1c-\x1f" if in_class else r"[\s\x0b\x1c-\x1f]"
+            parts.append(escape)
+            i += 2
+            continue
+        if char == "[":
+            in_class = True
+        elif char == "]":
+            in_class = False
+        parts.append(char)
+        i += 1
+    return "".join(parts)
+
+
+_RE2_SCANS = (
+    tuple(re2.compile(_re2_source(pattern)) for pattern in _RE_SCANS)
+    if re2 is not None and os.getenv("GCA_RE2", "").lower() == "true"
+    else None
+)
+
+
+def _scan_patterns(code: str) -> Tuple[Any, Any, Any, Any]:
+    """Return the functional-colour, export-class, property and method patterns for *code*."""
+    if _RE2_SCANS is not None and code.isascii():
+        return _RE2_SCANS
+    return _RE_SCANS
 
 
 class ValidationReport(TypedDict):
@@ -24,10 +157,11 @@ def validate(code: str, tokens: Dict[str, str]) -> ValidationReport:
     errors: List[str] = []
     warnings: List[str] = []
 
-    errors.extend(validate_design_tokens(code, tokens))
-    errors.extend(validate_colors(code, tokens))
-    errors.extend(validate_syntax(code))
-    errors.extend(validate_structure(code))
+    # Every layer appends into the same list instead of returning its own.
+    validate_design_tokens(code, tokens, code_lower=code.lower(), errors=errors)
+    validate_colors(code, tokens, errors=errors)
+    validate_syntax(code, errors=errors)
+    validate_structure(code, errors=errors)
 
     return {
         "is_valid": len(errors) == 0,
@@ -41,96 +175,299 @@ def validate_component(code: str, tokens: Dict[str, str]) -> ValidationReport:
     return validate(code, tokens)
 
 
-def validate_design_tokens(code: str, tokens: Dict[str, str]) -> List[str]:
-    """Ensure core design tokens are present in generated source."""
-    errors: List[str] = []
+# Tokens shared by every task of a validate_batch worker process.  They are sent
+# once through the pool initializer instead of being pickled with each task.
+_batch_tokens: Dict[str, str] = {}
+
+
+def validate_batch(
+    codes: Sequence[str],
+    tokens: Dict[str, str],
+    *,
+    max_workers: Optional[int] = None,
+    chunksize: int = 16,
+) -> List[ValidationReport]:
+    """
+    Validate many components against the same tokens across worker processes.
+
+    Reports are returned in the order of *codes*.  *max_workers* defaults to
+    the CPU count; with ``max_workers=1`` or a single component everything runs
+    in this process and no pool is started.
+    """
+    if max_workers == 1 or len(codes) <= 1:
+        return [validate(code, tokens) for code in codes]
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_set_batch_tokens,
+        initargs=(dict(tokens),),
+    ) as executor:
+        return list(executor.map(_validate_with_batch_tokens, codes, chunksize=chunksize))
+
+
+def _set_batch_tokens(tokens: Dict[str, str]) -> None:
+    """Pool initializer: store the batch's tokens in the worker process."""
+    global _batch_tokens
+    _batch_tokens = tokens
+
+
+def _validate_with_batch_tokens(code: str) -> ValidationReport:
+    """Pool task: validate *code* against the worker's batch tokens."""
+    return validate(code, _batch_tokens)
+
+
+# Syntax errors that no amount of further input can repair.
+_FATAL_SYNTAX_PREFIXES = (
+    "SYNTAX_ERROR: Early closing",
+    "SYNTAX_ERROR: Improper nesting",
+)
+
+
+def validate_partial(buffer: str, tokens: Dict[str, str]) -> Tuple[bool, List[str]]:
+    """
+    Check a still-streaming component prefix for errors that are already final.
+
+    Returns ``(definitely_invalid, partial_errors)``.  Only complete lines are
+    inspected, so a colour literal cut off at the end of the buffer is never
+    misread.  Unauthorized colours and early-closing or mis-nested brackets
+    cannot be repaired by later output; missing tokens, unclosed brackets and
+    unclosed strings may still be completed and are ignored here.
+    """
+    settled = buffer[: buffer.rfind("\n") + 1]
+    errors = validate_colors(settled, tokens)
+    errors.extend(
+        error for error in validate_syntax(settled) if error.startswith(_FATAL_SYNTAX_PREFIXES)
+    )
+    return bool(errors), errors
+
+
+def validate_design_tokens(
+    code: str,
+    tokens: Dict[str, str],
+    *,
+    code_lower: Optional[str] = None,
+    errors: Optional[List[str]] = None,
+) -> List[str]:
+    """
+    Ensure core design tokens are present in generated source.
+
+    Every token is looked up case-insensitively in one pass over the
+    lowercased source.  *code_lower* is ``code.lower()`` when the caller
+    already has it; the source is lowercased once here otherwise.  Errors are
+    appended to *errors* when given, and that list is returned.
+    """
+    if errors is None:
+        errors = []
+    if code_lower is None:
+        code_lower = code.lower()
 
     primary = tokens["primary_color"].lower()
-    if primary not in code.lower():
+    radius = tokens["border_radius"].lower()
+    font_family = tokens["font_family"].lower()
+    present = _present_needles(code_lower, (primary, radius, font_family))
+
+    if primary not in present:
         errors.append("MISSING_PRIMARY_COLOR: Primary design token not found.")
 
-    if tokens["border_radius"] not in code:
+    if radius not in present:
         errors.append("MISSING_BORDER_RADIUS: Border radius token not found.")
 
-    if tokens["font_family"].lower() not in code.lower():
+    if font_family not in present:
         errors.append("MISSING_FONT_FAMILY: Font family token not found.")
 
     return errors
 
 
-def validate_colors(code: str, tokens: Dict[str, str]) -> List[str]:
+def _present_needles(haystack: str, needles: Tuple[str, ...]) -> FrozenSet[str]:
+    """
+    Return the *needles* that occur in *haystack*.
+
+    With pyahocorasick installed every needle is found in one pass over the
+    haystack; otherwise each is tested with ``in``, which is as fast for the
+    handful of design tokens checked today.
+    """
+    if ahocorasick is None or not all(needles):
+        return frozenset(needle for needle in needles if needle in haystack)
+    automaton = _needle_automaton(needles)
+    return frozenset(needle for _, needle in automaton.iter(haystack))
+
+
+@functools.lru_cache(maxsize=8)
+def _needle_automaton(needles: Tuple[str, ...]) -> Any:
+    """Build the Aho–Corasick automaton for *needles* once per needle set."""
+    automaton = ahocorasick.Automaton()
+    for needle in needles:
+        automaton.add_word(needle, needle)
+    automaton.make_automaton()
+    return automaton
+
+
+def validate_colors(
+    code: str,
+    tokens: Dict[str, str],
+    *,
+    errors: Optional[List[str]] = None,
+) -> List[str]:
     """
     Strict color validator.
 
     Rules:
-    - Extract all hex colors and allow ONLY exact design-system hex tokens.
+    - Extract all hex colors and allow ONLY design-system hex tokens, written
+      as 6 digits or as their exact 3-digit shorthand (#fff for #ffffff).
     - Reject rgba(), rgb(), hsl(), hsla(), hwb().
     - Reject named colors (including black, white).
+
+    Errors are appended to *errors* when given, and that list is returned.
     """
-    errors: List[str] = []
+    if errors is None:
+        errors = []
 
-    allowed_tokens = {
-        value.lower()
-        for value in tokens.values()
-        if isinstance(value, str) and re.fullmatch(r"#[0-9a-fA-F]{6}", value)
-    }
+    allowed_rgb = _allowed_rgb(tuple(value for value in tokens.values() if isinstance(value, str)))
+
+    functional, hex_literals = _color_literals(code)
+
+    # Violations are collected in first-seen order, each distinct literal once.
+    # dict.fromkeys de-duplicates in C, so a token repeated throughout the
+    # source is parsed once and no duplicate message is ever formatted.  The
+    # three rules' literals cannot collide (a '(' / a '#' / a bare identifier).
+    violations: Dict[str, None] = {}
 
     # 1) Reject functional color formats.
-    func_pattern = re.compile(r"\b(rgba?|hsla?|hwb)\s*\([^)]*\)", re.IGNORECASE)
-    for match in func_pattern.finditer(code):
-        errors.append(
-            f"UNAUTHORIZED_COLOR: {match.group(0)} is not part of the design system."
-        )
+    violations.update(dict.fromkeys(functional))
 
     # 2) Reject non-token hex literals.
-    hex_pattern = re.compile(r"#[0-9a-fA-F]{3,8}\b")
-    for match in hex_pattern.finditer(code):
-        found = match.group(0)
-        if found.lower() not in allowed_tokens:
-            errors.append(
-                f"UNAUTHORIZED_COLOR: {found} is not part of the design system."
-            )
+    for found in dict.fromkeys(hex_literals):
+        if _hex_rgb(found) not in allowed_rgb:
+            violations[found] = None
 
     # 3) Reject named colors in CSS-like declarations.
-    named_colors = {
-        "black",
-        "white",
-        "red",
-        "blue",
-        "green",
-        "yellow",
-        "orange",
-        "purple",
-        "pink",
-        "brown",
-        "gray",
-        "grey",
-        "teal",
-        "navy",
-        "maroon",
-        "cyan",
-        "magenta",
-        "gold",
-        "silver",
-        "lime",
-        "olive",
-        "coral",
-        "tomato",
-        "violet",
-        "indigo",
-    }
-    named_pattern = re.compile(r":\s*([a-zA-Z]+)\b")
-    for match in named_pattern.finditer(code):
-        candidate = match.group(1).lower()
-        if candidate in named_colors:
-            errors.append(
-                f"UNAUTHORIZED_COLOR: {match.group(1)} is not part of the design system."
-            )
+    # Each rule is skipped outright (a C-level 'in' scan) when the character
+    # its pattern must start with cannot occur; see _color_literals for 1 and 2.
+    if ":" in code:
+        for match in _NAMED_VALUE_RE.finditer(code):
+            found = match.group(1)
+            if found.lower() in _NAMED_COLORS:
+                violations[found] = None
+
+    errors.extend(
+        f"UNAUTHORIZED_COLOR: {found} is not part of the design system." for found in violations
+    )
+    return errors
+
+
+# Per-character actions for the syntax scanner.  Only characters in this table
+# can change scanner state; _SYNTAX_SPECIAL_RE jumps straight between them.
+# Newlines are not special: the scanner records offsets and line numbers are
+# derived afterwards, only for the events that are reported.
+# The tables stay keyed by one-character str: code[i] returns a cached string
+# whose hash is cached too, so a dict lookup is cheaper here than ord() into a
+# bytearray or dispatching on a regex group index (both measured slower).
+_ACT_QUOTE, _ACT_SLASH, _ACT_OPENER, _ACT_CLOSER = range(1, 5)
+
+_SYNTAX_ACTIONS: Dict[str, int] = {
+    "'": _ACT_QUOTE,
+    '"': _ACT_QUOTE,
+    "`": _ACT_QUOTE,
+    "/": _ACT_SLASH,
+    "(": _ACT_OPENER,
+    "[": _ACT_OPENER,
+    "{": _ACT_OPENER,
+    ")": _ACT_CLOSER,
+    "]": _ACT_CLOSER,
+    "}": _ACT_CLOSER,
+}
+_SYNTAX_SPECIAL_RE = re.compile(r"['\"`/()\[\]{}]")
+
+# Jump patterns specialised on (source has quotes, source has "//" or "/*").
+# A source without quotes cannot contain a string literal and one without
+# either comment opener cannot contain a comment, so those characters are never
+# stops: template markup like ``</div>`` is skipped over instead of visited.
+_SYNTAX_SPECIAL_RES: Dict[Tuple[bool, bool], "re.Pattern[str]"] = {
+    (True, True): _SYNTAX_SPECIAL_RE,
+    (True, False): re.compile(r"['\"`()\[\]{}]"),
+    (False, True): re.compile(r"[/()\[\]{}]"),
+    (False, False): re.compile(r"[()\[\]{}]"),
+}
+# One search for either comment opener; two substring tests for "//" and "/*"
+# are each slower than this on markup dense with "</".
+_COMMENT_OPEN_RE = re.compile(r"/[/*]")
+
+# Rest of a string literal up to and including its closing quote, with
+# backslash escapes consumed in pairs (unrolled so the engine never backtracks).
+_STRING_BODY_RE: Dict[str, "re.Pattern[str]"] = {
+    quote: re.compile(rf"[^\\{quote}]*(?:\\.[^\\{quote}]*)*{quote}", re.DOTALL)
+    for quote in "'\"`"
+}
+
+_BRACKET_PAIRS = {"(": ")", "[": "]", "{": "}"}
+_BRACKET_INVERSE = {")": "(", "]": "[", "}": "{"}
+
+# Syntax events reported by _scan_syntax as (kind, offset, char, opener, opener_offset).
+_EV_EARLY_CLOSE, _EV_BAD_NESTING, _EV_UNCLOSED_COMMENT, _EV_UNCLOSED_STRING, _EV_MISSING_CLOSE = range(5)
+
+SyntaxEvent = Tuple[int, int, str, str, int]
+
+
+@functools.lru_cache(maxsize=8)
+def _allowed_rgb(token_values: Tuple[str, ...]) -> FrozenSet[int]:
+    """
+    Return the 24-bit RGB ints of the 6-digit hex tokens among *token_values*.
+
+    Tokens are compared as ints, so matches need no lowercasing.  Memoised on
+    the token values, since one design system is validated many times.
+    """
+    return frozenset(int(value[1:], 16) for value in token_values if _TOKEN_HEX_RE.fullmatch(value))
 
-    return _dedupe(errors)
 
+def _hex_rgb(literal: str) -> int:
+    """
+    Return the 24-bit RGB value of a ``#rgb`` / ``#rrggbb`` literal, else -1.
 
-def validate_syntax(code: str) -> List[str]:
+    Other lengths carry alpha (#rgba, #rrggbbaa) or are not colours at all,
+    so they never match a token.
+    """
+    digits = literal[1:]
+    if len(digits) == 6:
+        return int(digits, 16)
+    if len(digits) == 3:
+        red, green, blue = digits
+        return int(red * 2 + green * 2 + blue * 2, 16)
+    return -1
+
+
+def _color_literals(code: str) -> Tuple[List[str], List[str]]:
+    """Return the functional-notation and hex colour literals in *code*, in source order."""
+    has_paren = "(" in code
+    has_hash = "#" in code
+    if not (has_paren or has_hash):
+        return [], []
+    if _COLOR_HS is not None and code.isascii():
+        return _color_literals_hyperscan(code.encode("ascii"))
+    return (
+        _scan_patterns(code)[0].findall(code) if has_paren else [],
+        _HEX_COLOR_RE.findall(code) if has_hash else [],
+    )
+
+
+def _color_literals_hyperscan(data: bytes) -> Tuple[List[str], List[str]]:
+    """
+    Hyperscan counterpart of the re scan in _color_literals.
+
+    Hyperscan reports every match, including ones nested inside an earlier
+    match (``rgb(`` inside ``rgb(rgb(1)``), so overlaps are dropped per
+    pattern to reproduce re.finditer's non-overlapping results.
+    """
+    found: Tuple[List[str], List[str]] = ([], [])
+    last_end = [0, 0]
+    for pattern_id, start, end in sorted(scan(_COLOR_HS, data), key=lambda hit: (hit[1], hit[2])):
+        if start < last_end[pattern_id]:
+            continue
+        last_end[pattern_id] = end
+        found[pattern_id].append(data[start:end].decode("ascii"))
+    return found
+
+
+def validate_syntax(code: str, *, errors: Optional[List[str]] = None) -> List[str]:
     """
     Stack-based syntax validation.
 
@@ -139,103 +476,133 @@ def validate_syntax(code: str) -> List[str]:
     - Missing closing braces/brackets/parentheses
     - Improper nesting
     - Unclosed template strings and string literals
+
+    Errors are appended to *errors* when given, and that list is returned.
     """
-    errors: List[str] = []
+    if errors is None:
+        errors = []
+    events = _scan_syntax(code)
+    if not events:
+        return errors
 
-    pairs = {"(": ")", "[": "]", "{": "}"}
-    inverse = {")": "(", "]": "[", "}": "{"}
-    stack: List[tuple[str, int]] = []
+    newline_offsets = _newline_offsets(code)
 
-    i = 0
-    line = 1
+    def line_at(offset: int) -> int:
+        return bisect_right(newline_offsets, offset) + 1
+
+    for kind, offset, ch, opener, opener_offset in events:
+        if kind == _EV_EARLY_CLOSE:
+            errors.append(f"SYNTAX_ERROR: Early closing '{ch}' found on line {line_at(offset)}.")
+        elif kind == _EV_BAD_NESTING:
+            errors.append(
+                f"SYNTAX_ERROR: Improper nesting on line {line_at(offset)}; "
+                f"expected '{_BRACKET_PAIRS[opener]}' to close '{opener}' opened on line "
+                f"{line_at(opener_offset)}, got '{ch}'."
+            )
+        elif kind == _EV_UNCLOSED_COMMENT:
+            errors.append("SYNTAX_ERROR: Unclosed multiline comment.")
+        elif kind == _EV_UNCLOSED_STRING:
+            literal = "template string" if ch == "`" else "string literal"
+            errors.append(f"SYNTAX_ERROR: Unclosed {literal} starting on line {line_at(offset)}.")
+        else:
+            errors.append(
+                f"SYNTAX_ERROR: Missing closing '{_BRACKET_PAIRS[opener]}' for '{opener}' "
+                f"opened on line {line_at(opener_offset)}."
+            )
+    return errors
+
+
+def _scan_syntax(code: str) -> List[SyntaxEvent]:
+    """
+    Scan *code* once and return its syntax events in source order.
+
+    The scanner only does state transitions and records character offsets;
+    message formatting and line numbers are left to validate_syntax.  Runs of
+    characters that cannot change state (anything outside _SYNTAX_ACTIONS) are
+    skipped with one regex search instead of being stepped through one at a time.
+    """
+    events: List[SyntaxEvent] = []
+    # The bracket stack is kept as two parallel lists (opener, offset) so a
+    # push or pop never allocates a tuple; one-character strings are interned.
+    stack_chars: List[str] = []
+    stack_offsets: List[int] = []
+    push_char, pop_char = stack_chars.append, stack_chars.pop
+    push_offset, pop_offset = stack_offsets.append, stack_offsets.pop
+
+    actions = _SYNTAX_ACTIONS
+    has_strings = '"' in code or "'" in code or "`" in code
+    has_comments = "/" in code and _COMMENT_OPEN_RE.search(code) is not None
+    next_special = _SYNTAX_SPECIAL_RES[has_strings, has_comments].search
     length = len(code)
+    match = next_special(code)
 
-    while i < length:
+    while match is not None:
+        i = match.start()
         ch = code[i]
+        action = actions[ch]
 
-        if ch == "\n":
-            line += 1
-            i += 1
-            continue
-
-        # Single-line comments
-        if ch == "/" and i + 1 < length and code[i + 1] == "/":
-            i += 2
-            while i < length and code[i] != "\n":
-                i += 1
-            continue
+        if action == _ACT_SLASH:
+            nxt = code[i + 1] if i + 1 < length else ""
 
-        # Multi-line comments
-        if ch == "/" and i + 1 < length and code[i + 1] == "*":
-            i += 2
-            while i < length - 1:
-                if code[i] == "\n":
-                    line += 1
-                if code[i] == "*" and code[i + 1] == "/":
-                    i += 2
+            # Single-line comments
+            if nxt == "/":
+                i = code.find("\n", i + 2)
+                if i == -1:
                     break
-                i += 1
-            else:
-                errors.append("SYNTAX_ERROR: Unclosed multiline comment.")
-            continue
 
-        # String / template literals with unclosed detection
-        if ch in {"'", '"', "`"}:
-            quote = ch
-            start_line = line
-            i += 1
-            closed = False
-            while i < length:
-                if code[i] == "\n":
-                    line += 1
-                if code[i] == "\\" and i + 1 < length:
-                    i += 2
-                    continue
-                if code[i] == quote:
-                    i += 1
-                    closed = True
+            # Multi-line comments
+            elif nxt == "*":
+                end = code.find("*/", i + 2)
+                if end == -1:
+                    events.append((_EV_UNCLOSED_COMMENT, i, ch, "", 0))
                     break
+                i = end + 2
+
+            else:
                 i += 1
 
-            if not closed:
-                if quote == "`":
-                    errors.append(
-                        f"SYNTAX_ERROR: Unclosed template string starting on line {start_line}."
-                    )
-                else:
-                    errors.append(
-                        f"SYNTAX_ERROR: Unclosed string literal starting on line {start_line}."
-                    )
-            continue
+        # String / template literals with unclosed detection
+        elif action == _ACT_QUOTE:
+            literal = _STRING_BODY_RE[ch].match(code, i + 1)
+            if literal is None:
+                events.append((_EV_UNCLOSED_STRING, i, ch, "", 0))
+                break
+            i = literal.end()
 
         # Bracket stack matching
-        if ch in pairs:
-            stack.append((ch, line))
-        elif ch in inverse:
-            if not stack:
-                errors.append(
-                    f"SYNTAX_ERROR: Early closing '{ch}' found on line {line}."
-                )
+        elif action == _ACT_OPENER:
+            push_char(ch)
+            push_offset(i)
+            i += 1
+        else:
+            if not stack_chars:
+                events.append((_EV_EARLY_CLOSE, i, ch, "", 0))
             else:
-                opener, opener_line = stack.pop()
-                if opener != inverse[ch]:
-                    expected = pairs[opener]
-                    errors.append(
-                        f"SYNTAX_ERROR: Improper nesting on line {line}; expected '{expected}' "
-                        f"to close '{opener}' opened on line {opener_line}, got '{ch}'."
-                    )
+                opener = pop_char()
+                opener_offset = pop_offset()
+                if opener != _BRACKET_INVERSE[ch]:
+                    events.append((_EV_BAD_NESTING, i, ch, opener, opener_offset))
+            i += 1
 
-        i += 1
+        match = next_special(code, i)
 
-    for opener, opener_line in stack:
-        errors.append(
-            f"SYNTAX_ERROR: Missing closing '{pairs[opener]}' for '{opener}' opened on line {opener_line}."
-        )
+    for opener, opener_offset in zip(stack_chars, stack_offsets):
+        events.append((_EV_MISSING_CLOSE, length, "", opener, opener_offset))
+
+    return events
 
-    return errors
 
+def _newline_offsets(code: str) -> List[int]:
+    """Return the offset of every newline in *code*, in ascending order."""
+    offsets: List[int] = []
+    index = code.find("\n")
+    while index != -1:
+        offsets.append(index)
+        index = code.find("\n", index + 1)
+    return offsets
 
-def validate_structure(code: str) -> List[str]:
+
+def validate_structure(code: str, *, errors: Optional[List[str]] = None) -> List[str]:
     """
     Validate Angular component structure.
 
@@ -245,45 +612,30 @@ def validate_structure(code: str) -> List[str]:
     - at least one typed property
     - at least one method
     - source ends with closing brace
-    """
-    has_component = "@Component" in code
-    class_match = re.search(r"\bexport\s+class\s+\w+\s*\{", code)
-    ends_with_brace = code.rstrip().endswith("}")
-
-    class_body = _extract_class_body(code, class_match.start()) if class_match else ""
-
-    # Typed property, e.g. foo: string = 'bar';  or  total: number;
-    has_typed_property = bool(
-        re.search(
-            r"\b(?:public|private|protected)?\s*\w+\s*:\s*"
-            r"[A-Za-z_][A-Za-z0-9_<>,\[\]\s|]*\s*(=|;)",
-            class_body,
-        )
-    )
 
-    # Method signature, e.g. submit(): void { ... }
-    has_method = bool(
-        re.search(
-            r"\b\w+\s*\([^)]*\)\s*(?::\s*[A-Za-z_][A-Za-z0-9_<>,\[\]\s|]*)?\s*\{",
-            class_body,
-        )
-    )
+    Errors are appended to *errors* when given, and that list is returned.
+    """
+    if errors is None:
+        errors = []
+    if not _has_component_structure(code):
+        errors.append("INCOMPLETE_STRUCTURE: Angular component structure invalid.")
+    return errors
 
-    if not all([has_component, class_match, has_typed_property, has_method, ends_with_brace]):
-        return ["INCOMPLETE_STRUCTURE: Angular component structure invalid."]
 
-    return []
+def _has_component_structure(code: str) -> bool:
+    """Return True when *code* meets every validate_structure requirement."""
+    # All requirements map to one error, so checks run cheapest first and
+    # stop at the first failure.
+    if "@Component" not in code or not code.rstrip().endswith("}"):
+        return False
 
+    _, export_class_re, typed_property_re, method_re = _scan_patterns(code)
+    class_match = export_class_re.search(code) if "class" in code else None
+    if class_match is None:
+        return False
 
-def _dedupe(items: List[str]) -> List[str]:
-    """Return list without duplicates while preserving order."""
-    seen = set()
-    result: List[str] = []
-    for item in items:
-        if item not in seen:
-            seen.add(item)
-            result.append(item)
-    return result
+    class_body = _extract_class_body(code, class_match.start())
+    return typed_property_re.search(class_body) is not None and method_re.search(class_body) is not None
 
 
 def _extract_class_body(code: str, class_start_index: int) -> str: